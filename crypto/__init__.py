@@ -5,4 +5,7 @@ Submodules
 ==========
 * :py:mod:`.babyjubjub`: babyjubjub ECC functions & point operations
 * :py:mod:`.elgamal`: elgamal key generation,encryption, re-encryption, decryption, and HE operations 
+* :py:mod:`.expr`: lazy HE expressions evaluated with one multi-scalar multiplication
+* :py:mod:`.vectorized`: optional numpy backend for batched point addition
+* :py:mod:`.tally`: append-only, checkpointed store of running encrypted sums
 """
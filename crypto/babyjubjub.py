@@ -69,13 +69,6 @@ Fq.ZERO = Fq(0)
 Fq.ONE = Fq(1)
 Fq.MINUS_ONE = Fq(-1)
 
-assert Fq.ZERO + Fq.ZERO == Fq.ZERO
-assert Fq.ZERO + Fq.ONE == Fq.ONE
-assert Fq.ONE + Fq.ZERO == Fq.ONE
-assert Fq.ZERO - Fq.ONE == Fq.MINUS_ONE
-assert Fq.ZERO * Fq.ONE == Fq.ZERO
-assert Fq.ONE * Fq.ZERO == Fq.ZERO
-
 
 #BABYJUBJUB_A = Fq(1)
 #BABYJUBJUB_D = Fq(9706598848417545097372247223557719406784115219466060233080913168975159366771)
@@ -143,4 +136,98 @@ class Point(object):
 Point.ZERO = Point(Fq.ZERO, Fq.ONE)
 Point.GENERATOR = Point(Fq(BABYJUBJUB_GENERATOR_X), Fq(BABYJUBJUB_GENERATOR_Y))
 
-assert Point.ZERO + Point.ZERO == Point.ZERO
+
+class ProjectivePoint(object):
+    # projective (X : Y : Z) form of a Point with u = X/Z, v = Y/Z.
+    # additions and doublings need no field inversion; only to_affine() does.
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @staticmethod
+    def from_affine(p):
+        return ProjectivePoint(p.u, p.v, Fq.ONE)
+
+    def to_affine(self):
+        zinv = self.z.inv()
+        return Point(self.x * zinv, self.y * zinv)
+
+    def __add__(self, a):
+        # add-2008-bbjlp, complete on BabyJubJub
+        A = self.z * a.z
+        B = A * A
+        C = self.x * a.x
+        D = self.y * a.y
+        E = BABYJUBJUB_D * C * D
+        F = B - E
+        G = B + E
+        x3 = A * F * ((self.x + self.y) * (a.x + a.y) - C - D)
+        y3 = A * G * (D - BABYJUBJUB_A * C)
+        z3 = F * G
+        return ProjectivePoint(x3, y3, z3)
+
+    def double(self):
+        # dbl-2008-bbjlp
+        B = (self.x + self.y) * (self.x + self.y)
+        C = self.x * self.x
+        D = self.y * self.y
+        E = BABYJUBJUB_A * C
+        F = E + D
+        H = self.z * self.z
+        J = F - H - H
+        x3 = (B - C - D) * J
+        y3 = F * (E - D)
+        z3 = F * J
+        return ProjectivePoint(x3, y3, z3)
+
+    def negate(self):
+        return ProjectivePoint(-self.x, self.y, self.z)
+
+    def __mul__(self, s):
+        return ProjectivePoint.multi_mul([(self, s)])
+
+    @staticmethod
+    def multi_mul(terms):
+        # Straus' trick: sum of s_i * P_i sharing one chain of doublings.
+        # scalars are taken as signed digits: s > CURVE_ORDER / 2 becomes
+        # -(CURVE_ORDER - s), i.e. a free negation of P and a short chain,
+        # so subtraction costs the same as addition.
+        pairs = []
+        for (p, s) in terms:
+            k = s.s
+            if k == 0:
+                continue
+            if k > CURVE_ORDER // 2:
+                p, k = p.negate(), CURVE_ORDER - k
+            pairs.append((p, k))
+        ret = ProjectivePoint.ZERO
+        if not pairs:
+            return ret
+        for i in reversed(range(max(k.bit_length() for (_, k) in pairs))):
+            ret = ret.double()
+            for (p, k) in pairs:
+                if (k >> i) & 1:
+                    ret = ret + p
+        return ret
+
+    def __eq__(self, a):
+        return self.x * a.z == a.x * self.z and self.y * a.z == a.y * self.z
+
+    def __str__(self):
+        return 'ProjectivePoint(%s, %s, %s)' % (self.x, self.y, self.z)
+
+
+ProjectivePoint.ZERO = ProjectivePoint(Fq.ZERO, Fq.ONE, Fq.ONE)
+
+
+# sanity checks of the field and curve arithmetic. kept out of module import
+# to keep it cheap, run from evaluation.py.
+def self_check():
+    assert Fq.ZERO + Fq.ZERO == Fq.ZERO
+    assert Fq.ZERO + Fq.ONE == Fq.ONE
+    assert Fq.ONE + Fq.ZERO == Fq.ONE
+    assert Fq.ZERO - Fq.ONE == Fq.MINUS_ONE
+    assert Fq.ZERO * Fq.ONE == Fq.ZERO
+    assert Fq.ONE * Fq.ZERO == Fq.ZERO
+    assert Point.ZERO + Point.ZERO == Point.ZERO
@@ -49,18 +49,31 @@ class Value(tuple):
             return str(v)
     @staticmethod
     def get_params(params: CryptoParams = None, crypto_backend: str = None) -> CryptoParams:
-        return CryptoParams('elgamal') 
+        return ELGAMAL_PARAMS
+
+
+ELGAMAL_PARAMS = CryptoParams('elgamal')
 
 
 class CipherValue(Value):
+    # shared default, only overridden per instance for other params
+    params = ELGAMAL_PARAMS
+
     def __new__(cls, contents: Optional[Collection] = None, *,
                 params: CryptoParams = None, crypto_backend: str = None):
         params = Value.get_params(params, crypto_backend)
-        content = [0] * params.cipher_len
-        if contents:
-            content[:len(contents)] = contents[:]
-        ret = super(CipherValue, cls).__new__(cls, content)
-        ret.params = params
+        if not contents and cls is CipherValue and params is ELGAMAL_PARAMS:
+            return CipherValue.ZERO
+        elif contents is not None and len(contents) == params.cipher_len:
+            # fast path: full ciphertext, no zero padding needed
+            ret = tuple.__new__(cls, contents)
+        else:
+            content = [0] * params.cipher_len
+            if contents:
+                content[:len(contents)] = contents[:]
+            ret = tuple.__new__(cls, content)
+        if params is not ELGAMAL_PARAMS:
+            ret.params = params
         return ret
 
     def __len__(self) -> int:
@@ -81,10 +94,12 @@ class PublicKeyValue(Value):
                 params: CryptoParams = None, crypto_backend: str = None):
         params = Value.get_params(params, crypto_backend)
         if contents is None:
-            return super(PublicKeyValue, cls).__new__(cls, [0] * params.key_len)
+            if cls is PublicKeyValue:
+                return PublicKeyValue.ZERO
+            return tuple.__new__(cls, [0] * params.key_len)
         else:
             assert len(contents) == params.key_len
-            return super(PublicKeyValue, cls).__new__(cls, contents)
+            return tuple.__new__(cls, contents)
 
 
 class RandomnessValue(Value):
@@ -92,10 +107,12 @@ class RandomnessValue(Value):
                 params: CryptoParams = None, crypto_backend: str = None):
         params = Value.get_params(params, crypto_backend)
         if contents is None:
-            return super(RandomnessValue, cls).__new__(cls, [0] * params.randomness_len)
+            if cls is RandomnessValue:
+                return RandomnessValue.ZERO
+            return tuple.__new__(cls, [0] * params.randomness_len)
         else:
             assert len(contents) == params.randomness_len
-            return super(RandomnessValue, cls).__new__(cls, contents)
+            return tuple.__new__(cls, contents)
 
 
 class AddressValue(Value):
@@ -128,6 +145,12 @@ class AddressValue(Value):
         return self.get_balance(self)
 
 
+# interned zero values, safe to share since values are immutable
+CipherValue.ZERO = tuple.__new__(CipherValue, [0] * ELGAMAL_PARAMS.cipher_len)
+PublicKeyValue.ZERO = tuple.__new__(PublicKeyValue, [0] * ELGAMAL_PARAMS.key_len)
+RandomnessValue.ZERO = tuple.__new__(RandomnessValue, [0] * ELGAMAL_PARAMS.randomness_len)
+
+
 class KeyPair:
     def __init__(self, pk: PublicKeyValue, sk: PrivateKeyValue):
         self.pk = pk
@@ -9,9 +9,28 @@ from crtypes import KeyPair, CipherValue, PrivateKeyValue, PublicKeyValue
 
 from timer import time_measure
 
+# optional vectorized backend for bulk work. importing numpy costs far more than
+# the rest of this package, so the backend is only imported on the first bulk call.
+# None: not tried yet, False: not available
+vectorized = None
+
+
+def _vectorized():
+    global vectorized
+    if vectorized is None:
+        try:
+            import vectorized as backend
+        except ImportError:
+            backend = False
+        vectorized = backend
+    return vectorized
+
 
 class ElgamalCrypto():
     params = CryptoParams('elgamal')
+    # below these sizes the scalar path beats the vectorized one
+    batch_add_vectorized_min = 8
+    aggregate_vectorized_min = 5000
     # generate sk and pk
     def _generate_key_pair(self) -> Tuple[List[int], int]:
         sk = randbelow(babyjubjub.CURVE_ORDER)
@@ -35,7 +54,7 @@ class ElgamalCrypto():
         def deserialize(operand: Union[CipherValue, int]) -> Union[Tuple[babyjubjub.Point, babyjubjub.Point], int]:
             if isinstance(operand, CipherValue):
                 # if ciphertext is 0, return (Point.ZERO, Point.ZERO) == Enc(0, 0)
-                if operand == CipherValue([0]*4, params=operand.params):
+                if operand == CipherValue.ZERO:
                     return babyjubjub.Point.ZERO, babyjubjub.Point.ZERO
                 else:
                     c1 = babyjubjub.Point(babyjubjub.Fq(operand[0]), babyjubjub.Fq(operand[1]))
@@ -61,6 +80,28 @@ class ElgamalCrypto():
             raise ValueError(f'Unsupported operation {op}')
 
         return [e1.u.s, e1.v.s, e2.u.s, e2.v.s]
+    # perform HE addition element-wise over two lists of ciphertexts
+    def do_batch_add(self, public_key: List[int], args1: List[CipherValue], args2: List[CipherValue]) -> List[List[int]]:
+        if len(args1) != len(args2):
+            raise ValueError(f'Batch sizes differ: {len(args1)} and {len(args2)}')
+        if len(args1) >= self.batch_add_vectorized_min and _vectorized():
+            return vectorized.batch_add(args1, args2)
+        return [self.do_op('+', public_key, a, b) for a, b in zip(args1, args2)]
+    # perform HE addition over all ciphertexts
+    def do_aggregate(self, public_key: List[int], args: List[CipherValue]) -> List[int]:
+        if len(args) >= self.aggregate_vectorized_min and _vectorized():
+            return vectorized.aggregate(args)
+        return self._aggregate_scalar(args)
+    # HE addition over all ciphertexts in projective coordinates, one inversion per component
+    def _aggregate_scalar(self, args: List[CipherValue]) -> List[int]:
+        e1 = e2 = babyjubjub.ProjectivePoint.ZERO
+        for arg in args:
+            if any(arg):
+                e1 = e1 + babyjubjub.ProjectivePoint(babyjubjub.Fq(arg[0]), babyjubjub.Fq(arg[1]), babyjubjub.Fq.ONE)
+                e2 = e2 + babyjubjub.ProjectivePoint(babyjubjub.Fq(arg[2]), babyjubjub.Fq(arg[3]), babyjubjub.Fq.ONE)
+        e1 = e1.to_affine()
+        e2 = e2.to_affine()
+        return [e1.u.s, e1.v.s, e2.u.s, e2.v.s]
     # re-randomization
     def do_rerand(self, arg: CipherValue, public_key: List[int]) -> Tuple[List[int], List[int]]:
         # homomorphically add encryption of zero to re-randomize
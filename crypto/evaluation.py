@@ -1,6 +1,13 @@
+import importlib
+import os
+import sys
+import elgamal as elgamal_module
 from elgamal import ElgamalCrypto
-from crtypes import CipherValue, KeyPair
+from expr import EncryptedExpr
+from crtypes import CipherValue, KeyPair, PublicKeyValue
+from params import CryptoParams
 from timer import time_measure
+from tally import TallyStore, TallySnapshot
 
 import babyjubjub
 from secrets import randbelow
@@ -73,6 +80,92 @@ class TestElgamal():
             for i in range(n):
                 res = self.eg.do_op('*', None, self.cipher1, 2)
 
+    # evaluate a chain of HE operations with do_op
+    def eval_hom_chain(self,n):
+        with time_measure("elgamal-HE-chain-do_op"):
+            for i in range(n):
+                res = self.eg.do_op('+', None, self.cipher1, self.cipher2)
+                res = self.eg.do_op('*', None, CipherValue(res), 3)
+                res = self.eg.do_op('-', None, CipherValue(res), self.cipher1)
+
+    # evaluate the same chain as a lazy expression
+    def eval_hom_expr(self,n):
+        with time_measure("elgamal-HE-chain-expr"):
+            for i in range(n):
+                res = ((EncryptedExpr.wrap(self.cipher1) + self.cipher2) * 3 - self.cipher1).evaluate()
+
+    # evaluate element-wise HE addition of n ciphertext pairs, scalar vs vectorized backend
+    def eval_batch_add(self,n):
+        args1 = [self.cipher1] * n
+        args2 = [self.cipher2] * n
+        with time_measure(f"elgamal-HE-batch-add-scalar-{n}"):
+            res = [self.eg.do_op('+', None, a, b) for a, b in zip(args1, args2)]
+        vectorized = elgamal_module._vectorized()
+        if vectorized:
+            with time_measure(f"elgamal-HE-batch-add-vectorized-{n}"):
+                res_vec = vectorized.batch_add(args1, args2)
+            assert res == res_vec
+
+    # evaluate HE sum over n ciphertexts, scalar vs vectorized backend
+    def eval_aggregate(self,n):
+        args = [self.cipher1, self.cipher2] * (n // 2)
+        with time_measure(f"elgamal-HE-aggregate-scalar-{n}"):
+            res = self.eg._aggregate_scalar(args)
+        vectorized = elgamal_module._vectorized()
+        if vectorized:
+            with time_measure(f"elgamal-HE-aggregate-vectorized-{n}"):
+                res_vec = vectorized.aggregate(args)
+            assert res == res_vec
+
+    # evaluate n tally updates spread over 10 counters, with checkpoints and recovery
+    def eval_tally(self,n,path='eval.tly'):
+        if os.path.exists(path):
+            os.remove(path)
+        with time_measure(f"tally-add-{n}"):
+            with TallyStore(path, checkpoint_every=1000) as store:
+                for i in range(n):
+                    store.add(f'counter{i % 10}', self.cipher1)
+        committed = store.snapshot()
+        expected = CipherValue(self.eg.do_aggregate(None, [self.cipher1] * len(range(0, n, 10))))
+        assert committed['counter0'] == expected
+        with time_measure("tally-recover"):
+            snapshot = TallySnapshot(path)
+        assert snapshot.sums == committed
+        # a torn block at the end is dropped on reopen
+        with open(path, 'ab') as f:
+            f.write(b'TLY1' + bytes(40))
+        with TallyStore(path) as store:
+            assert store.snapshot() == committed
+            store.add('counter0', self.cipher2)
+        assert TallySnapshot(path)['counter0'] == CipherValue(self.eg.do_op('+', None, expected, self.cipher2))
+        os.remove(path)
+
+    # evaluate construction of n ciphertext / public key values and params lookups
+    def eval_construction(self,n):
+        contents = list(self.cipher1)
+        with time_measure(f"construct-CipherValue-{n}"):
+            for i in range(n):
+                c = CipherValue(contents)
+        with time_measure(f"construct-PublicKeyValue-{n}"):
+            for i in range(n):
+                pk = PublicKeyValue(self.pk)
+        with time_measure(f"CryptoParams-lookup-{n}"):
+            for i in range(n):
+                l = CryptoParams('elgamal').cipher_len
+
+    # evaluate importing the package modules n times in this interpreter
+    def eval_import(self,n):
+        names = ('elgamal', 'crtypes', 'params', 'meta', 'babyjubjub', 'timer')
+        saved = {name: sys.modules[name] for name in names if name in sys.modules}
+        try:
+            with time_measure(f"import-elgamal-{n}"):
+                for i in range(n):
+                    for name in names:
+                        sys.modules.pop(name, None)
+                    importlib.import_module('elgamal')
+        finally:
+            sys.modules.update(saved)
+
     # evaluate decryption (without finding the discrete log)
     def eval_dec(self,n):
         with time_measure("elgamal-dencrypt-result"):
@@ -120,6 +213,8 @@ class TestElgamal():
 
 
 # Start the evaluation process:
+# sanity check the curve arithmetic (no longer run on import of babyjubjub)
+babyjubjub.self_check()
 elgamal = TestElgamal()
 # n = number of times to run the functions
 n = 1
@@ -139,6 +234,22 @@ n = 1
 # Evaluate HE mul n times
 #elgamal.eval_hom_mul(n)
 
+# Evaluate a chain of HE ops n times, with do_op and as a lazy expression
+#elgamal.eval_hom_chain(n)
+#elgamal.eval_hom_expr(n)
+
+# Evaluate batch add / aggregate over many ciphertexts, scalar vs vectorized (needs numpy).
+# batch add is faster vectorized from ~8 pairs, aggregate from ~5000 ciphertexts
+#elgamal.eval_batch_add(1000)
+#elgamal.eval_aggregate(100000)
+
+# Evaluate the checkpointed tally store
+#elgamal.eval_tally(10000)
+
+# Evaluate value construction and package import time
+#elgamal.eval_construction(1000000)
+#elgamal.eval_import(20)
+
 # Evaluate decryption n times
 #elgamal.eval_dec(n)
 
@@ -0,0 +1,131 @@
+from typing import Dict, Union
+
+import babyjubjub
+from crtypes import CipherValue
+
+
+class EncryptedExpr():
+    # lazy homomorphic expression over elgamal ciphertexts.
+    # +, - and scalar * only record the operation; evaluate() folds the whole
+    # graph into one linear combination sum(k_i * C_i) and computes it with a
+    # single multi-scalar multiplication per ciphertext component.
+    def __init__(self, op: str, *operands: Union['EncryptedExpr', CipherValue, int]):
+        self.op = op
+        self.operands = operands
+        self._value = None
+
+    @staticmethod
+    def wrap(operand: Union['EncryptedExpr', CipherValue]) -> 'EncryptedExpr':
+        if isinstance(operand, EncryptedExpr):
+            return operand
+        elif isinstance(operand, CipherValue):
+            return EncryptedExpr('leaf', operand)
+        else:
+            raise ValueError(f'Unsupported operand {operand}')
+
+    def __add__(self, other: Union['EncryptedExpr', CipherValue]) -> 'EncryptedExpr':
+        return EncryptedExpr('+', self, EncryptedExpr.wrap(other))
+
+    def __radd__(self, other: CipherValue) -> 'EncryptedExpr':
+        return EncryptedExpr('+', EncryptedExpr.wrap(other), self)
+
+    def __sub__(self, other: Union['EncryptedExpr', CipherValue]) -> 'EncryptedExpr':
+        return EncryptedExpr('-', self, EncryptedExpr.wrap(other))
+
+    def __rsub__(self, other: CipherValue) -> 'EncryptedExpr':
+        return EncryptedExpr('-', EncryptedExpr.wrap(other), self)
+
+    def __neg__(self) -> 'EncryptedExpr':
+        return EncryptedExpr('*', self, -1)
+
+    def __mul__(self, k: int) -> 'EncryptedExpr':
+        if not isinstance(k, int):
+            raise ValueError(f'Unsupported operation * with {k}')
+        return EncryptedExpr('*', self, k)
+
+    __rmul__ = __mul__
+
+    def _children(self):
+        if self.op in ('+', '-'):
+            return self.operands
+        elif self.op == '*':
+            return self.operands[:1]
+        return ()
+
+    # fold the graph into {ciphertext: coefficient mod CURVE_ORDER}.
+    # shared sub-expressions are folded once, identical ciphertexts are merged
+    # and terms whose coefficients cancel are dropped. the walk is iterative, so
+    # long chains such as e = e + c do not hit the recursion limit.
+    def _terms(self) -> Dict[CipherValue, int]:
+        # count how often each node is an operand, so that the terms of a node
+        # can be taken over instead of copied once its last user folds it
+        uses = {id(self): 0}
+        stack = [self]
+        while stack:
+            for child in stack.pop()._children():
+                if id(child) in uses:
+                    uses[id(child)] += 1
+                else:
+                    uses[id(child)] = 1
+                    stack.append(child)
+
+        memo: Dict[int, Dict[CipherValue, int]] = {}
+
+        def release(node: 'EncryptedExpr', owned: bool) -> Dict[CipherValue, int]:
+            uses[id(node)] -= 1
+            if uses[id(node)] == 0:
+                return memo.pop(id(node))
+            return dict(memo[id(node)]) if owned else memo[id(node)]
+
+        stack = [self]
+        while stack:
+            node = stack[-1]
+            if id(node) in memo:
+                stack.pop()
+                continue
+            missing = [child for child in node._children() if id(child) not in memo]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            if node.op == 'leaf':
+                cipher = node.operands[0]
+                # the all-zero ciphertext is Enc(0, 0), i.e. the identity
+                terms = {} if not any(cipher) else {cipher: 1}
+            elif node.op in ('+', '-'):
+                sign = 1 if node.op == '+' else -1
+                terms = release(node.operands[0], owned=True)
+                for cipher, k in release(node.operands[1], owned=False).items():
+                    k = (terms.get(cipher, 0) + sign * k) % babyjubjub.CURVE_ORDER
+                    if k:
+                        terms[cipher] = k
+                    else:
+                        terms.pop(cipher, None)
+            elif node.op == '*':
+                scalar = node.operands[1] % babyjubjub.CURVE_ORDER
+                child_terms = release(node.operands[0], owned=False)
+                terms = {}
+                if scalar:
+                    terms = {cipher: k * scalar % babyjubjub.CURVE_ORDER
+                             for cipher, k in child_terms.items()}
+            else:
+                raise ValueError(f'Unsupported operation {node.op}')
+            memo[id(node)] = terms
+        return memo[id(self)]
+
+    # evaluate the expression and return the resulting ciphertext
+    def evaluate(self) -> CipherValue:
+        if self._value is not None:
+            return self._value
+        terms = self._terms()
+        c1_terms, c2_terms = [], []
+        for cipher, k in terms.items():
+            c1 = babyjubjub.Point(babyjubjub.Fq(cipher[0]), babyjubjub.Fq(cipher[1]))
+            c2 = babyjubjub.Point(babyjubjub.Fq(cipher[2]), babyjubjub.Fq(cipher[3]))
+            c1_terms.append((babyjubjub.ProjectivePoint.from_affine(c1), babyjubjub.Fr(k)))
+            c2_terms.append((babyjubjub.ProjectivePoint.from_affine(c2), babyjubjub.Fr(k)))
+        e1 = babyjubjub.ProjectivePoint.multi_mul(c1_terms).to_affine()
+        e2 = babyjubjub.ProjectivePoint.multi_mul(c2_terms).to_affine()
+        params = next(iter(terms)).params if terms else None
+        self._value = CipherValue([e1.u.s, e1.v.s, e2.u.s, e2.v.s], params=params)
+        return self._value
@@ -4,9 +4,46 @@ import re
 from meta import cryptoparams
 
 class CryptoParams:
-
-    def __init__(self, crypto_name: str):
-        self.crypto_name = crypto_name
+    # one shared, immutable instance per crypto_name. all fields are derived from
+    # meta.cryptoparams once, on first use, so lookups are plain slot reads.
+    __slots__ = ('crypto_name', 'identifier_name', 'key_bits', 'key_bytes', 'key_len', 'rnd_bytes',
+                 'rnd_chunk_size', 'randomness_len', 'cipher_bytes_payload', 'symmetric', 'cipher_payload_len',
+                 'cipher_len', 'cipher_chunk_size', 'enc_signed_as_unsigned')
+
+    _instances = {}
+
+    def __new__(cls, crypto_name: str):
+        instance = cls._instances.get(crypto_name)
+        if instance is not None:
+            return instance
+        p = cryptoparams[crypto_name]
+        instance = super().__new__(cls)
+        setattr_ = super().__setattr__
+        setattr_(instance, 'crypto_name', crypto_name)
+        setattr_(instance, 'identifier_name', re.sub('[^a-zA-Z0-9$_]', '_', crypto_name).title())
+        setattr_(instance, 'symmetric', p['symmetric'])
+        setattr_(instance, 'key_bits', p['key_bits'])
+        setattr_(instance, 'key_bytes', int(math.ceil(p['key_bits'] / 8)))
+        setattr_(instance, 'cipher_chunk_size', p['cipher_chunk_size'])
+        setattr_(instance, 'key_len', 1 if p['symmetric'] else int(math.ceil(instance.key_bytes / p['cipher_chunk_size'])))
+        setattr_(instance, 'rnd_bytes', p['rnd_bytes'])
+        setattr_(instance, 'rnd_chunk_size', p['rnd_chunk_size'])
+        setattr_(instance, 'randomness_len', 0 if p['symmetric'] else int(math.ceil(p['rnd_bytes'] / p['rnd_chunk_size'])))
+        setattr_(instance, 'cipher_bytes_payload', p['cipher_payload_bytes'])
+        setattr_(instance, 'cipher_payload_len', int(math.ceil(p['cipher_payload_bytes'] / p['cipher_chunk_size'])))
+        # Additional uint to store sender address
+        setattr_(instance, 'cipher_len', instance.cipher_payload_len + 1 if p['symmetric'] else instance.cipher_payload_len)
+        setattr_(instance, 'enc_signed_as_unsigned', p['enc_signed_as_unsigned'])
+        return cls._instances.setdefault(crypto_name, instance)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        return CryptoParams, (self.crypto_name,)
 
     def __eq__(self, other):
         return isinstance(other, CryptoParams) and self.crypto_name == other.crypto_name
@@ -14,56 +51,5 @@ class CryptoParams:
     def __hash__(self):
         return self.crypto_name.__hash__()
 
-    @property
-    def identifier_name(self) -> str:
-        return re.sub('[^a-zA-Z0-9$_]', '_', self.crypto_name).title()
-
-    @property
-    def key_bits(self) -> int:
-        return cryptoparams[self.crypto_name]['key_bits']
-
-    @property
-    def key_bytes(self) -> int:
-        return int(math.ceil(self.key_bits / 8))
-
-    @property
-    def key_len(self) -> int:
-        return 1 if self.is_symmetric_cipher() else int(math.ceil(self.key_bytes / self.cipher_chunk_size))
-
-    @property
-    def rnd_bytes(self) -> int:
-        return cryptoparams[self.crypto_name]['rnd_bytes']
-
-    @property
-    def rnd_chunk_size(self) -> int:
-        return cryptoparams[self.crypto_name]['rnd_chunk_size']
-
-    @property
-    def randomness_len(self) -> int:
-        return 0 if self.is_symmetric_cipher() else int(math.ceil(self.rnd_bytes / self.rnd_chunk_size))
-
-    @property
-    def cipher_bytes_payload(self) -> int:
-        return cryptoparams[self.crypto_name]['cipher_payload_bytes']
-
     def is_symmetric_cipher(self) -> bool:
-        return cryptoparams[self.crypto_name]['symmetric']
-
-    @property
-    def cipher_payload_len(self) -> int:
-        return int(math.ceil(self.cipher_bytes_payload / self.cipher_chunk_size))
-
-    @property
-    def cipher_len(self) -> int:
-        if self.is_symmetric_cipher():
-            return self.cipher_payload_len + 1 # Additional uint to store sender address
-        else:
-            return self.cipher_payload_len
-
-    @property
-    def cipher_chunk_size(self) -> int:
-        return cryptoparams[self.crypto_name]['cipher_chunk_size']
-
-    @property
-    def enc_signed_as_unsigned(self) -> int:
-        return cryptoparams[self.crypto_name]['enc_signed_as_unsigned']
+        return self.symmetric
@@ -0,0 +1,286 @@
+# append-only store for running encrypted sums, keyed by counter id.
+#
+# file layout: a sequence of checkpoint blocks
+#   header  magic (4s) | kind (B) | seq (Q) | payload length (I)
+#   payload entries of  id length (H) | utf-8 counter id | ciphertext (4 x 32 bytes, big endian)
+#   trailer crc32 of header and payload (I)
+# a DELTA block holds the new sums of the counters touched since the previous
+# checkpoint, a FULL block holds every sum and makes all earlier blocks obsolete.
+# blocks are appended and fsynced, so a crash can at worst leave one torn block
+# at the end, which is detected by its length or crc and dropped.
+# a FULL checkpoint is written as a new file that replaces the old one, and the
+# first checkpoint of an empty file is a FULL one, so the file always starts
+# with a FULL block and recovery only reads the blocks since.
+# the file is never shrunk in place, which keeps the mappings of concurrent
+# readers valid; torn bytes are dropped by replacing the file instead.
+
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Tuple, Union
+
+from params import CryptoParams
+from crtypes import CipherValue
+from elgamal import ElgamalCrypto
+
+MAGIC = b'TLY1'
+DELTA = 0
+FULL = 1
+
+_HEADER = struct.Struct('>4sBQI')
+_ID_LEN = struct.Struct('>H')
+_CRC = struct.Struct('>I')
+_ID_MAX_BYTES = 0xffff
+
+
+def _encode_cipher(cipher: Union[CipherValue, List[int]], params: CryptoParams) -> bytes:
+    return b''.join(int(c).to_bytes(params.cipher_chunk_size, 'big') for c in cipher)
+
+
+def _encode_block(kind: int, seq: int, sums: Dict[str, CipherValue], params: CryptoParams) -> bytes:
+    entries = []
+    for counter_id, cipher in sums.items():
+        key = counter_id.encode('utf-8')
+        entries.append(_ID_LEN.pack(len(key)) + key + _encode_cipher(cipher, params))
+    payload = b''.join(entries)
+    block = _HEADER.pack(MAGIC, kind, seq, len(payload)) + payload
+    return block + _CRC.pack(zlib.crc32(block))
+
+
+def _write_all(fd: int, data: bytes):
+    # unbuffered, so nothing of a failed write can be flushed again later
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _decode_entries(buf, start: int, end: int, sums: Dict[str, CipherValue], params: CryptoParams):
+    chunk = params.cipher_chunk_size
+    cipher_bytes = chunk * params.cipher_len
+    pos = start
+    while pos < end:
+        (key_len,) = _ID_LEN.unpack_from(buf, pos)
+        pos += _ID_LEN.size
+        counter_id = bytes(buf[pos:pos + key_len]).decode('utf-8')
+        pos += key_len
+        raw = buf[pos:pos + cipher_bytes]
+        pos += cipher_bytes
+        sums[counter_id] = CipherValue([int.from_bytes(raw[i:i + chunk], 'big')
+                                        for i in range(0, cipher_bytes, chunk)], params=params)
+
+
+def _load(path: str, params: CryptoParams) -> Tuple[Dict[str, CipherValue], int, int, int]:
+    # returns (sums, seq, valid_end, checkpoints since the last FULL block)
+    # of the last complete checkpoint in the file
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return {}, 0, 0, 0
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        size = len(buf)
+        blocks = []
+        seq = 0
+        since_full = 0
+        pos = 0
+        while pos + _HEADER.size + _CRC.size <= size:
+            magic, kind, block_seq, length = _HEADER.unpack_from(buf, pos)
+            end = pos + _HEADER.size + length + _CRC.size
+            if magic != MAGIC or end > size:
+                break
+            (crc,) = _CRC.unpack_from(buf, end - _CRC.size)
+            if zlib.crc32(buf[pos:end - _CRC.size]) != crc:
+                break
+            if kind == FULL:
+                blocks = []
+                since_full = -1
+            since_full += 1
+            blocks.append((pos + _HEADER.size, end - _CRC.size))
+            seq = block_seq
+            pos = end
+        # only the blocks from the last FULL one on need to be replayed
+        sums = {}
+        for (start, stop) in blocks:
+            _decode_entries(buf, start, stop, sums, params)
+    return sums, seq, pos, since_full
+
+
+class TallySnapshot():
+    # read-only view of the last complete checkpoint of a tally file.
+    # it never takes a lock, so it can be opened while a writer is appending.
+    def __init__(self, path: str, params: CryptoParams = None):
+        self.params = params or CryptoParams('elgamal')
+        self.sums, self.seq, _, _ = _load(path, self.params)
+
+    def __getitem__(self, counter_id: str) -> CipherValue:
+        return self.sums[counter_id]
+
+    def __contains__(self, counter_id: str) -> bool:
+        return counter_id in self.sums
+
+    def __len__(self) -> int:
+        return len(self.sums)
+
+    def get(self, counter_id: str, default=None):
+        return self.sums.get(counter_id, default)
+
+    def counters(self) -> List[str]:
+        return list(self.sums)
+
+
+class TallyStore():
+    # single-writer tally store. updates are buffered per counter and folded into
+    # the running sums at the next checkpoint, which appends one block and fsyncs.
+    # a checkpoint happens on checkpoint(), close(), and automatically once
+    # checkpoint_every updates are pending or checkpoint_interval seconds have passed.
+    # every full_every-th checkpoint compacts the file into a single FULL block.
+    def __init__(self, path: str, *, checkpoint_every: int = 10000, checkpoint_interval: float = 60.0,
+                 full_every: int = 64, params: CryptoParams = None):
+        self.path = path
+        self.params = params or CryptoParams('elgamal')
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.full_every = full_every
+        self.eg = ElgamalCrypto()
+        self._lock = threading.Lock()
+        self._fd = None
+        # set while torn bytes of a failed checkpoint may be left at the end of the file
+        self._dirty = False
+        # recover from the last complete checkpoint
+        self._sums, self.seq, valid_end, self._since_full = _load(path, self.params)
+        if os.path.exists(path) and os.path.getsize(path) != valid_end:
+            # drop the torn tail by swapping in a clean copy, readers may have the old file mapped
+            self._compact(self._sums, self.seq)
+            self._since_full = 0
+        else:
+            self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            # end of the last complete checkpoint
+            self._end = valid_end
+        self._pending: Dict[str, List[CipherValue]] = {}
+        self._n_pending = 0
+        self._last_checkpoint = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _append(self, block: bytes):
+        _write_all(self._fd, block)
+        os.fsync(self._fd)
+        self._end += len(block)
+
+    def _compact(self, sums: Dict[str, CipherValue], seq: int):
+        # write sums as one FULL block to a new file and atomically replace the old one.
+        # the rename is the last step that can fail, once it is done the checkpoint is committed.
+        tmp = self.path + '.tmp'
+        block = _encode_block(FULL, seq, sums, self.params)
+        fd = os.open(tmp, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _write_all(fd, block)
+            os.fsync(fd)
+            os.replace(tmp, self.path)
+        except OSError:
+            os.close(fd)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        try:
+            dir_fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = fd
+        self._end = len(block)
+
+    def _discard_tail(self):
+        # remove whatever part of a failed checkpoint reached the file, so that the
+        # next checkpoint is not appended behind torn bytes and lost on recovery
+        if os.path.getsize(self.path) == self._end:
+            return
+        self._dirty = True
+        try:
+            self._compact(self._sums, self.seq)
+            self._since_full = 0
+            self._dirty = False
+        except OSError:
+            # e.g. the disk is still full. the next checkpoint compacts again
+            # rather than appending behind the torn bytes
+            pass
+
+    # homomorphically add cipher to the counter's running sum
+    def add(self, counter_id: str, cipher: Union[CipherValue, List[int]]):
+        self.add_batch([(counter_id, cipher)])
+
+    def add_batch(self, updates: Iterable[Tuple[str, Union[CipherValue, List[int]]]]):
+        # validate everything before buffering, a bad update would fail every later checkpoint
+        updates = list(updates)
+        for counter_id, cipher in updates:
+            if len(counter_id.encode('utf-8')) > _ID_MAX_BYTES:
+                raise ValueError(f'Counter id longer than {_ID_MAX_BYTES} bytes: {counter_id[:32]}...')
+            if len(cipher) != self.params.cipher_len or not all(isinstance(c, int) for c in cipher):
+                raise ValueError(f'Invalid ciphertext for counter {counter_id[:32]}: {cipher}')
+        with self._lock:
+            for counter_id, cipher in updates:
+                self._pending.setdefault(counter_id, []).append(cipher)
+                self._n_pending += 1
+            due = (self._n_pending >= self.checkpoint_every
+                   or time.monotonic() - self._last_checkpoint >= self.checkpoint_interval)
+            if due:
+                self._checkpoint()
+
+    def checkpoint(self):
+        with self._lock:
+            self._checkpoint()
+
+    def _checkpoint(self):
+        if not self._pending and not self._dirty:
+            return
+        changed = {}
+        for counter_id, ciphers in self._pending.items():
+            if counter_id in self._sums:
+                ciphers = [self._sums[counter_id]] + ciphers
+            changed[counter_id] = CipherValue(self.eg.do_aggregate(None, ciphers), params=self.params)
+        # copy on write, so snapshots handed out earlier stay unchanged
+        sums = dict(self._sums)
+        sums.update(changed)
+        since_full = self._since_full + 1
+        try:
+            if since_full >= self.full_every or self._end == 0 or self._dirty:
+                self._compact(sums, self.seq + 1)
+                since_full = 0
+                self._dirty = False
+            else:
+                self._append(_encode_block(DELTA, self.seq + 1, changed, self.params))
+        except OSError:
+            # updates stay pending for the next checkpoint
+            self._discard_tail()
+            raise
+        self._since_full = since_full
+        self.seq += 1
+        self._sums = sums
+        self._pending = {}
+        self._n_pending = 0
+        self._last_checkpoint = time.monotonic()
+
+    # committed sums as of the last checkpoint; never mutated afterwards
+    def snapshot(self) -> Dict[str, CipherValue]:
+        return self._sums
+
+    def get(self, counter_id: str, default=None):
+        return self._sums.get(counter_id, default)
+
+    def close(self):
+        if self._fd is None:
+            return
+        try:
+            self.checkpoint()
+        finally:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,213 @@
+# vectorized BabyJubJub arithmetic for bulk work, requires numpy.
+# a batch of n Fq elements is an (8, n) uint64 array of 32-bit limbs
+# (least significant limb first, one contiguous row per limb) in Montgomery
+# form with R = 2^256. every limb product fits in 64 bits, so all operations
+# run as whole-array numpy ops and the python loops only go over the 8 limbs.
+
+from typing import List, Sequence
+
+import numpy as np
+
+import babyjubjub
+
+LIMBS = 8
+MASK = np.uint64(0xffffffff)
+SHIFT = np.uint64(32)
+
+
+def _int_to_limbs(x: int) -> np.ndarray:
+    return np.array([[(x >> (32 * j)) & 0xffffffff] for j in range(LIMBS)], dtype=np.uint64)
+
+
+P = babyjubjub.BASE_ORDER
+P_LIMBS = _int_to_limbs(P)
+P_INV = np.uint64(-pow(P, -1, 1 << 32) % (1 << 32))   # -p^-1 mod 2^32
+R2_LIMBS = _int_to_limbs(pow(2, 512, P))
+
+
+def _carry(a: np.ndarray) -> np.ndarray:
+    # normalize limbs to 32 bits, dropping the carry out of the top limb
+    for j in range(LIMBS - 1):
+        a[j + 1] += a[j] >> SHIFT
+        a[j] &= MASK
+    a[LIMBS - 1] &= MASK
+    return a
+
+
+def _sub_limbs(a: np.ndarray, b: np.ndarray):
+    # a - b mod 2^256 and the final borrow (1 where a < b)
+    out = np.empty_like(a)
+    borrow = np.zeros(a.shape[1], dtype=np.uint64)
+    for j in range(LIMBS):
+        x = a[j] - b[j] - borrow
+        borrow = x >> np.uint64(63)
+        out[j] = x & MASK
+    return out, borrow
+
+
+def _reduce_once(a: np.ndarray) -> np.ndarray:
+    # a < 2p -> a mod p
+    d, borrow = _sub_limbs(a, P_LIMBS)
+    return np.where(borrow.astype(bool), a, d)
+
+
+def _mont_mul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # a * b * R^-1 mod p. a may be a single (8, 1) constant.
+    # rows of t collect unnormalized 32-bit pieces and stay below 2^40
+    n = max(a.shape[1], b.shape[1])
+    t = np.zeros((2 * LIMBS, n), dtype=np.uint64)
+    for i in range(LIMBS):
+        prod = a[i] * b
+        t[i:i + LIMBS] += prod & MASK
+        t[i + 1:i + LIMBS + 1] += prod >> SHIFT
+    for i in range(LIMBS):
+        m = ((t[i] & MASK) * P_INV) & MASK
+        prod = P_LIMBS * m
+        t[i:i + LIMBS] += prod & MASK
+        t[i + 1:i + LIMBS + 1] += prod >> SHIFT
+        t[i + 1] += t[i] >> SHIFT
+    # t[LIMBS:] < 2p < 2^255, so nothing is lost by _carry
+    return _reduce_once(_carry(t[LIMBS:]))
+
+
+class FqBatch(object):
+    def __init__(self, limbs: np.ndarray):
+        self.limbs = limbs
+
+    @staticmethod
+    def from_ints(values: Sequence[int]) -> 'FqBatch':
+        raw = b''.join((v % P).to_bytes(32, 'little') for v in values)
+        limbs = np.frombuffer(raw, dtype='<u4').reshape(len(values), LIMBS).T.astype(np.uint64)
+        return FqBatch(_mont_mul(R2_LIMBS, limbs))
+
+    @staticmethod
+    def constant(value: int, n: int = 1) -> 'FqBatch':
+        return FqBatch(np.repeat(FqBatch.from_ints([value]).limbs, n, axis=1))
+
+    def to_ints(self) -> List[int]:
+        one = _int_to_limbs(1)
+        raw = _mont_mul(one, self.limbs).T.astype('<u4').tobytes()
+        return [int.from_bytes(raw[32 * i:32 * (i + 1)], 'little') for i in range(len(self))]
+
+    def __len__(self) -> int:
+        return self.limbs.shape[1]
+
+    def __getitem__(self, idx) -> 'FqBatch':
+        return FqBatch(self.limbs[:, idx])
+
+    def __neg__(self):
+        return FqBatch(np.zeros_like(self.limbs)) - self
+
+    def __add__(self, a):
+        # p < 2^254, so the sum of two reduced elements fits in 8 limbs
+        return FqBatch(_reduce_once(_carry(self.limbs + a.limbs)))
+
+    def __sub__(self, a):
+        d, borrow = _sub_limbs(self.limbs, a.limbs)
+        return FqBatch(_carry(d + P_LIMBS * borrow))
+
+    def __mul__(self, a):
+        return FqBatch(_mont_mul(self.limbs, a.limbs))
+
+    def inv(self):
+        # Montgomery's trick over a product tree: about three multiplications
+        # per element and a single scalar inversion. all elements must be non-zero.
+        n = len(self)
+        if n == 1:
+            return FqBatch.from_ints([pow(self.to_ints()[0], P - 2, P)])
+        padded = self
+        if n % 2:
+            padded = FqBatch(np.concatenate([self.limbs, FqBatch.constant(1).limbs], axis=1))
+        half = len(padded) // 2
+        lo, hi = padded[:half], padded[half:]
+        prod_inv = (lo * hi).inv()
+        return FqBatch(np.concatenate([(prod_inv * hi).limbs, (prod_inv * lo).limbs], axis=1)[:, :n])
+
+
+CURVE_A = FqBatch.constant(babyjubjub.BABYJUBJUB_A.s)
+CURVE_D = FqBatch.constant(babyjubjub.BABYJUBJUB_D.s)
+
+
+class PointBatch(object):
+    # batch of points in projective (X : Y : Z) form, see babyjubjub.ProjectivePoint
+    def __init__(self, x: FqBatch, y: FqBatch, z: FqBatch):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @staticmethod
+    def from_affine(us: Sequence[int], vs: Sequence[int]) -> 'PointBatch':
+        return PointBatch(FqBatch.from_ints(us), FqBatch.from_ints(vs), FqBatch.constant(1, len(us)))
+
+    def to_affine(self):
+        zinv = self.z.inv()
+        return (self.x * zinv).to_ints(), (self.y * zinv).to_ints()
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, idx) -> 'PointBatch':
+        return PointBatch(self.x[idx], self.y[idx], self.z[idx])
+
+    def concat(self, a):
+        return PointBatch(*(FqBatch(np.concatenate([c1.limbs, c2.limbs], axis=1))
+                            for (c1, c2) in ((self.x, a.x), (self.y, a.y), (self.z, a.z))))
+
+    def __add__(self, a):
+        # add-2008-bbjlp, same formulas as babyjubjub.ProjectivePoint
+        A = self.z * a.z
+        B = A * A
+        C = self.x * a.x
+        D = self.y * a.y
+        E = CURVE_D * C * D
+        F = B - E
+        G = B + E
+        x3 = A * F * ((self.x + self.y) * (a.x + a.y) - C - D)
+        y3 = A * G * (D - CURVE_A * C)
+        z3 = F * G
+        return PointBatch(x3, y3, z3)
+
+    def sum(self) -> babyjubjub.Point:
+        # pairwise tree reduction, one inversion at the very end
+        acc = self
+        while len(acc) > 1:
+            if len(acc) % 2:
+                acc = acc.concat(PointBatch.ZERO)
+            half = len(acc) // 2
+            acc = acc[:half] + acc[half:]
+        x, y, z = (babyjubjub.Fq(c.to_ints()[0]) for c in (acc.x, acc.y, acc.z))
+        return babyjubjub.ProjectivePoint(x, y, z).to_affine()
+
+
+PointBatch.ZERO = PointBatch(FqBatch.constant(0), FqBatch.constant(1), FqBatch.constant(1))
+
+
+def _components(ciphers: Sequence[Sequence[int]]):
+    # the all-zero ciphertext stands for Enc(0, 0) = (Point.ZERO, Point.ZERO)
+    rows = [c if any(c) else (0, 1, 0, 1) for c in ciphers]
+    c1 = PointBatch.from_affine([c[0] for c in rows], [c[1] for c in rows])
+    c2 = PointBatch.from_affine([c[2] for c in rows], [c[3] for c in rows])
+    return c1, c2
+
+
+# element-wise homomorphic addition of two equally long lists of ciphertexts
+def batch_add(args1: Sequence[Sequence[int]], args2: Sequence[Sequence[int]]) -> List[List[int]]:
+    assert len(args1) == len(args2)
+    if not args1:
+        return []
+    n = len(args1)
+    # both ciphertext components go through one batch
+    a1, a2 = _components(args1)
+    b1, b2 = _components(args2)
+    us, vs = (a1.concat(a2) + b1.concat(b2)).to_affine()
+    return [list(c) for c in zip(us[:n], vs[:n], us[n:], vs[n:])]
+
+
+# homomorphic sum of all ciphertexts
+def aggregate(args: Sequence[Sequence[int]]) -> List[int]:
+    if not args:
+        return [0, 1, 0, 1]
+    c1, c2 = _components(args)
+    e1 = c1.sum()
+    e2 = c2.sum()
+    return [e1.u.s, e1.v.s, e2.u.s, e2.v.s]